@@ -1,14 +1,141 @@
 """DeFiLlama API client with protocol resolution and caching."""
 
-import difflib
-from collections import Counter
+import re
+from collections import defaultdict
+from functools import cached_property, lru_cache
 
+import orjson
+from cachetools import TTLCache
 import requests
+import requests_cache
+from rapidfuzz import fuzz, process
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 BASE_URL = "https://api.llama.fi"
 REQUEST_TIMEOUT = 30
 AGGREGATE_TVL_KEYS = {"borrowed", "staking", "pool2", "vesting", "offers"}
 
+# On-disk HTTP cache settings. The bulk endpoints (/protocols, /hacks) are
+# multi-MB payloads that change slowly, so they get a long TTL; per-protocol
+# detail is fresher data and expires sooner.
+CACHE_NAME = ".defillama_cache"
+CACHE_DEFAULT_TTL = 3600
+CACHE_URL_TTLS = {
+    "*/protocols": 21600,
+    "*/hacks": 21600,
+    "*/protocol/*": 600,
+}
+
+
+# Strips version suffixes from child names: "Aave V3" / "Uniswap v2" -> base name.
+_VER_RE = re.compile(r"\s+[Vv]\d")
+
+# "parent-slug" -> "parent slug" (translate is cheaper than str.replace)
+_DASH_TO_SPACE = str.maketrans("-", " ")
+
+class _ProtocolIndex:
+    """Layered lookup structures over one protocols snapshot.
+
+    The exact-match maps are built eagerly in a single pass; the parent and
+    fuzzy layers are materialized lazily, so the common case of resolving an
+    exact slug or name never pays for them.
+    """
+
+    def __init__(self, protocols):
+        self._protocols = protocols
+        self.slug_map = {}
+        self.name_map = {}
+        for p in protocols:
+            self.slug_map[p.get("slug", "").lower()] = p
+            self.name_map[p.get("name", "").lower()] = p
+
+    @cached_property
+    def _parent_layer(self):
+        parent_slugs = set()
+        parent_children = {}  # parent_slug -> list of (child, base, base_lower)
+        parent_name_map = {}  # base name lowered ("aave") -> parent_slug
+        parent_space_map = {}  # slug as words ("aave dao") -> parent_slug
+
+        for p in self._protocols:
+            parent_ref = p.get("parentProtocol", "")
+            if parent_ref and parent_ref.startswith("parent#"):
+                ps = parent_ref.split("#", 1)[1].lower()
+                if ps not in parent_slugs:
+                    parent_slugs.add(ps)
+                    parent_space_map[ps.translate(_DASH_TO_SPACE)] = ps
+                # Strip the version suffix once here so parent-name matching
+                # and _build_parent_result never redo the string work.
+                base = _VER_RE.split(p.get("name", ""), 1)[0].strip()
+                base_lower = base.lower()
+                parent_children.setdefault(ps, []).append((p, base, base_lower))
+                parent_name_map[base_lower] = ps
+
+        return parent_slugs, parent_children, parent_name_map, parent_space_map
+
+    @property
+    def parent_slugs(self):
+        return self._parent_layer[0]
+
+    @property
+    def parent_children(self):
+        return self._parent_layer[1]
+
+    @property
+    def parent_name_map(self):
+        return self._parent_layer[2]
+
+    @property
+    def parent_space_map(self):
+        return self._parent_layer[3]
+
+    @cached_property
+    def all_candidates(self):
+        candidates = {}
+        for slug in self.slug_map:
+            candidates[slug] = ("slug", slug)
+        for name in self.name_map:
+            candidates[name] = ("name", name)
+        for ps in self.parent_slugs:
+            candidates[ps] = ("parent", ps)
+        for pname, ps in self.parent_name_map.items():
+            candidates[pname] = ("parent", ps)
+        return candidates
+
+    @cached_property
+    def candidate_len_buckets(self):
+        return _bucket_by_len(self.all_candidates)
+
+    @cached_property
+    def name_len_buckets(self):
+        return _bucket_by_len(self.name_map)
+
+
+def _bucket_by_len(keys):
+    """Group candidate keys by length for the fuzzy-stage pre-filter."""
+    by_len = defaultdict(list)
+    for key in keys:
+        by_len[len(key)].append(key)
+    return by_len
+
+
+def _length_band(by_len, query, cutoff):
+    """Drop candidates that fail the length bound for a similarity cutoff.
+
+    A ratio of at least `cutoff` requires |len(a)-len(b)| <= (1-cutoff)*max_len,
+    so most candidates can be rejected on length alone before any scoring.
+    `by_len` is a precomputed _bucket_by_len mapping.
+    """
+    n = len(query)
+    d = 1.0 - cutoff
+    lo = int(n * (1 - d))
+    hi = int(n / (1 - d)) if d < 1 else max(by_len, default=0)
+
+    filtered = []
+    for length in range(lo, hi + 1):
+        filtered.extend(by_len.get(length, ()))
+    return filtered
+
 
 class DefiLlamaAPIError(Exception):
     """Raised when an API request fails."""
@@ -24,10 +151,49 @@ class DefiLlamaClient:
     """HTTP client for the DeFiLlama API with caching and protocol resolution."""
 
     def __init__(self, timeout=REQUEST_TIMEOUT):
-        self.session = requests.Session()
+        # L2: sqlite-backed cache shared across runs. cache_control=True honors
+        # ETag/Last-Modified so expired entries revalidate with a cheap 304.
+        self.session = requests_cache.CachedSession(
+            cache_name=CACHE_NAME,
+            backend="sqlite",
+            expire_after=CACHE_DEFAULT_TTL,
+            urls_expire_after=CACHE_URL_TTLS,
+            cache_control=True,
+        )
+        # Tuned pool + retries: concurrent report fetches reuse warm TLS
+        # connections, and transient 429/5xx responses retry with backoff
+        # instead of failing the whole run.
+        adapter = HTTPAdapter(
+            pool_connections=16,
+            pool_maxsize=32,
+            max_retries=Retry(
+                total=3,
+                backoff_factor=0.3,
+                status_forcelist=(429, 500, 502, 503, 504),
+                allowed_methods=frozenset(["GET"]),
+                # Hand the final error response back instead of raising
+                # MaxRetryError, so raise_for_status() maps it to
+                # DefiLlamaAPIError like any other HTTP failure.
+                raise_on_status=False,
+            ),
+        )
+        self.session.mount("https://", adapter)
+        # Prefer brotli for the multi-MB bulk payloads; urllib3 decodes it
+        # transparently via the brotli package in requirements.txt.
+        self.session.headers["Accept-Encoding"] = "br, gzip"
         self.timeout = timeout
+        # L1: in-process memoization of the parsed bulk payloads.
         self._protocols_cache = None
         self._hacks_cache = None
+        self._hacks_by_name = None
+        self._protocol_index = None
+        # Resolution is deterministic per protocols snapshot, so memoize it
+        # per instance; the snapshot version in the key makes entries from a
+        # refreshed protocols list unreachable. Detail responses get a short
+        # in-memory TTL matching their disk-cache expiry.
+        self._protocols_version = 0
+        self._resolve_cached = lru_cache(maxsize=1024)(self._resolve_normalized)
+        self._detail_cache = TTLCache(maxsize=256, ttl=600)
 
     def _get(self, path):
         """Make a GET request and return parsed JSON."""
@@ -35,7 +201,9 @@ class DefiLlamaClient:
         try:
             resp = self.session.get(url, timeout=self.timeout)
             resp.raise_for_status()
-            return resp.json()
+            # orjson is markedly faster than resp.json() on the multi-MB
+            # /protocols and /hacks payloads.
+            return orjson.loads(resp.content)
         except requests.ConnectionError as e:
             raise DefiLlamaAPIError(f"Connection failed for {url}: {e}")
         except requests.Timeout:
@@ -49,16 +217,32 @@ class DefiLlamaClient:
         """Fetch and cache the full protocols list."""
         if self._protocols_cache is None:
             self._protocols_cache = self._get("/protocols")
+            self._protocol_index = None  # derived index follows the snapshot
+            self._protocols_version += 1
         return self._protocols_cache
 
+    def _get_protocol_index(self):
+        """Build (once) the lookup structures derived from the protocols list."""
+        if self._protocol_index is None:
+            self._protocol_index = _ProtocolIndex(self.get_protocols_list())
+        return self._protocol_index
+
     def get_protocol_detail(self, slug):
         """Fetch full protocol detail by slug."""
-        return self._get(f"/protocol/{slug}")
+        detail = self._detail_cache.get(slug)
+        if detail is None:
+            detail = self._detail_cache[slug] = self._get(f"/protocol/{slug}")
+        return detail
 
     def get_all_hacks(self):
         """Fetch and cache all hack records."""
         if self._hacks_cache is None:
             self._hacks_cache = self._get("/hacks")
+            # Index by lowercased protocol name so per-protocol lookups are
+            # O(1) instead of a scan over every hack record.
+            self._hacks_by_name = defaultdict(list)
+            for h in self._hacks_cache:
+                self._hacks_by_name[h.get("name", "").lower()].append(h)
         return self._hacks_cache
 
     def resolve_protocol(self, user_input):
@@ -66,26 +250,18 @@ class DefiLlamaClient:
 
         Returns dict with keys: slug, name, is_parent, children, category
         """
-        protocols = self.get_protocols_list()
         normalized = user_input.strip().lower()
+        return self._resolve_cached(normalized, self._protocols_version)
 
-        # Build lookup structures
-        slug_map = {}
-        name_map = {}
-        parent_slugs = set()
-        parent_children = {}  # parent_slug -> list of child protocols
+    def _resolve_normalized(self, normalized, _version):
+        """Resolution pipeline behind the per-instance LRU cache.
 
-        for p in protocols:
-            slug = p.get("slug", "")
-            name = p.get("name", "")
-            slug_map[slug.lower()] = p
-            name_map[name.lower()] = p
-
-            parent_ref = p.get("parentProtocol", "")
-            if parent_ref and parent_ref.startswith("parent#"):
-                ps = parent_ref.split("#", 1)[1]
-                parent_slugs.add(ps.lower())
-                parent_children.setdefault(ps.lower(), []).append(p)
+        `_version` ties cached entries to one protocols snapshot; misses
+        (ProtocolNotFoundError) are not cached by lru_cache.
+        """
+        idx = self._get_protocol_index()
+        slug_map = idx.slug_map
+        name_map = idx.name_map
 
         # Step 1: Exact slug match
         if normalized in slug_map:
@@ -109,41 +285,29 @@ class DefiLlamaClient:
                 "category": p.get("category"),
             }
 
-        # Step 3: Parent protocol match (by slug, slug-as-words, or derived display name)
-        if normalized in parent_slugs:
+        # Step 3: Parent protocol match (by slug, slug-as-words, or derived
+        # display name) — first access materializes the lazy parent layer
+        parent_children = idx.parent_children
+        if normalized in idx.parent_slugs:
             return self._build_parent_result(normalized, parent_children)
 
-        for ps in parent_slugs:
-            if normalized == ps.replace("-", " "):
-                return self._build_parent_result(ps, parent_children)
+        space_match = idx.parent_space_map.get(normalized)
+        if space_match is not None:
+            return self._build_parent_result(space_match, parent_children)
 
         # Also match against parent display names derived from children
-        parent_name_map = {}  # display_name.lower() -> parent_slug
-        for ps, children in parent_children.items():
-            for child in children:
-                child_name = child.get("name", "")
-                base = child_name.split(" V")[0].split(" v")[0].strip()
-                parent_name_map[base.lower()] = ps
-        if normalized in parent_name_map:
-            return self._build_parent_result(parent_name_map[normalized], parent_children)
+        if normalized in idx.parent_name_map:
+            return self._build_parent_result(idx.parent_name_map[normalized], parent_children)
 
         # Step 4: Fuzzy matching
-        all_candidates = {}
-        for slug in slug_map:
-            all_candidates[slug] = ("slug", slug)
-        for name in name_map:
-            all_candidates[name] = ("name", name)
-        for ps in parent_slugs:
-            all_candidates[ps] = ("parent", ps)
-        for pname, ps in parent_name_map.items():
-            all_candidates[pname] = ("parent", ps)
-
-        matches = difflib.get_close_matches(
-            normalized, all_candidates.keys(), n=5, cutoff=0.85
+        all_candidates = idx.all_candidates
+        matches = process.extract(
+            normalized, _length_band(idx.candidate_len_buckets, normalized, 0.85),
+            scorer=fuzz.WRatio, score_cutoff=85, limit=5,
         )
 
         if matches:
-            best = matches[0]
+            best = matches[0][0]
             kind, key = all_candidates[best]
 
             if kind == "parent":
@@ -167,17 +331,17 @@ class DefiLlamaClient:
                     "category": p.get("category"),
                 }
 
-        # No match found — gather suggestions
-        all_names = [p.get("name", "") for p in protocols]
-        suggestions = difflib.get_close_matches(normalized, [n.lower() for n in all_names], n=3, cutoff=0.4)
-        suggestion_names = []
-        for s in suggestions:
-            for p in protocols:
-                if p.get("name", "").lower() == s:
-                    suggestion_names.append(p["name"])
-                    break
-
-        msg = f"Protocol '{user_input}' not found."
+        # No match found — gather suggestions. name_map keys are already the
+        # lowercased names, and mapping back through it recovers display case.
+        suggestion_names = [
+            name_map[match]["name"]
+            for match, _score, _idx in process.extract(
+                normalized, _length_band(idx.name_len_buckets, normalized, 0.4),
+                scorer=fuzz.ratio, score_cutoff=40, limit=3,
+            )
+        ]
+
+        msg = f"Protocol '{normalized}' not found."
         if suggestion_names:
             msg += f" Did you mean: {', '.join(suggestion_names)}?"
         raise ProtocolNotFoundError(msg)
@@ -186,17 +350,25 @@ class DefiLlamaClient:
         """Build resolution result for a parent protocol."""
         children = parent_children.get(parent_slug, [])
 
-        # Derive category from children
-        categories = [c.get("category") for c in children if c.get("category")]
-        category = Counter(categories).most_common(1)[0][0] if categories else None
-
-        # Derive display name from parent slug or first child
-        name = parent_slug.replace("-", " ").title()
-        for child in children:
-            # Use the child name without version suffix if it matches
-            child_name = child.get("name", "")
-            base = child_name.split(" V")[0].split(" v")[0].strip()
-            if base.lower() == parent_slug.replace("-", " "):
+        # Derive category from children: most common wins, found in one pass
+        category = None
+        best_count = 0
+        counts = {}
+        for c, _base, _bl in children:
+            cat = c.get("category")
+            if not cat:
+                continue
+            n = counts[cat] = counts.get(cat, 0) + 1
+            if n > best_count:
+                category = cat
+                best_count = n
+
+        # Derive display name from parent slug or first child whose
+        # precomputed version-stripped base matches
+        parent_words = parent_slug.translate(_DASH_TO_SPACE)
+        name = parent_words.title()
+        for _child, base, base_lower in children:
+            if base_lower == parent_words:
                 name = base
                 break
 
@@ -204,15 +376,18 @@ class DefiLlamaClient:
             "slug": parent_slug,
             "name": name,
             "is_parent": True,
-            "children": [{"name": c["name"], "slug": c["slug"]} for c in children],
+            "children": [{"name": c["name"], "slug": c["slug"]} for c, _base, _bl in children],
             "category": category,
         }
 
     def find_hacks_for_protocol(self, protocol_name, child_names=None):
         """Filter hack records matching this protocol or its children."""
-        hacks = self.get_all_hacks()
+        self.get_all_hacks()  # ensures _hacks_by_name is built
         names_to_match = {protocol_name.lower()}
         if child_names:
             names_to_match.update(n.lower() for n in child_names)
 
-        return [h for h in hacks if h.get("name", "").lower() in names_to_match]
+        matched = []
+        for name in names_to_match:
+            matched.extend(self._hacks_by_name.get(name, ()))
+        return matched
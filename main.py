@@ -1,11 +1,14 @@
 """DeFi research agent — DeFiLlama data + web research reports."""
 
 import argparse
-import json
+import os
 import sys
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import date
 from pathlib import Path
 
+import orjson
+
 from defillama import DefiLlamaClient, DefiLlamaAPIError, ProtocolNotFoundError
 from markdown_report import render_markdown
 from report import build_report
@@ -20,33 +23,129 @@ from web_research import (
 def run_report(client, protocol_name, tvl_days=180, verified_only=True):
     """Orchestrate API calls and build a structured report dict."""
     meta = client.resolve_protocol(protocol_name)
-    detail = client.get_protocol_detail(meta["slug"])
-
     child_names = [c["name"] for c in meta["children"]]
-    hacks = client.find_hacks_for_protocol(meta["name"], child_names)
 
-    web_research = None
-    if not verified_only:
-        web_research = {
-            "analyst_coverage": search_analyst_coverage(meta["name"]),
-            "audit_reports": search_audit_reports(meta["name"]),
-            "community_sentiment": search_community_sentiment(meta["name"]),
-            "red_flags": search_red_flags(meta["name"]),
-        }
+    # Once meta is known the remaining calls are independent network fetches,
+    # so fire them concurrently instead of paying one RTT each in sequence.
+    # requests.Session is thread-safe for GETs via its urllib3 pool.
+    with ThreadPoolExecutor(max_workers=6) as pool:
+        detail_f = pool.submit(client.get_protocol_detail, meta["slug"])
+        hacks_f = pool.submit(client.find_hacks_for_protocol, meta["name"], child_names)
+
+        web_futures = None
+        if not verified_only:
+            web_futures = {
+                "analyst_coverage": pool.submit(search_analyst_coverage, meta["name"]),
+                "audit_reports": pool.submit(search_audit_reports, meta["name"]),
+                "community_sentiment": pool.submit(search_community_sentiment, meta["name"]),
+                "red_flags": pool.submit(search_red_flags, meta["name"]),
+            }
+
+        detail = detail_f.result()
+        hacks = hacks_f.result()
+        web_research = None
+        if web_futures is not None:
+            web_research = {key: f.result() for key, f in web_futures.items()}
 
     return build_report(detail, meta, hacks, tvl_history_days=tvl_days, web_research=web_research, verified_only=verified_only)
 
 
+def save_markdown_report(report):
+    """Render a report as markdown and save it under reports/. Returns the path."""
+    md = render_markdown(report)
+    slug = report["metadata"]["slug"]
+    filename = f"{slug}-{date.today().isoformat()}.md"
+    reports_dir = Path("reports")
+    reports_dir.mkdir(exist_ok=True)
+    report_path = reports_dir / filename
+    report_path.write_text(md)
+    return report_path
+
+
+# Per-worker client for batch mode; clients are not picklable, so each worker
+# process builds its own in the pool initializer.
+_worker_client = None
+
+
+def _init_batch_worker():
+    global _worker_client
+    _worker_client = DefiLlamaClient()
+
+
+def _batch_worker(protocol_name, tvl_days, verified_only):
+    return run_report(_worker_client, protocol_name, tvl_days=tvl_days, verified_only=verified_only)
+
+
+def run_batch(protocol_names, tvl_days=180, verified_only=True):
+    """Generate reports for many protocols across worker processes.
+
+    Returns (reports, failures) where failures is a list of (name, error).
+    """
+    # Warm the shared sqlite HTTP cache so every worker reads the bulk
+    # /protocols and /hacks payloads from disk instead of re-downloading.
+    warm_client = DefiLlamaClient()
+    warm_client.get_protocols_list()
+    warm_client.get_all_hacks()
+
+    reports = []
+    failures = []
+    workers = min(os.cpu_count() or 1, len(protocol_names))
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker) as pool:
+        futures = [
+            (name, pool.submit(_batch_worker, name, tvl_days, verified_only))
+            for name in protocol_names
+        ]
+        for name, future in futures:
+            try:
+                reports.append(future.result())
+            except (ProtocolNotFoundError, DefiLlamaAPIError) as e:
+                failures.append((name, str(e)))
+
+    return reports, failures
+
+
 def main():
     parser = argparse.ArgumentParser(
         description="Generate a DeFi protocol research report from DeFiLlama data."
     )
-    parser.add_argument("protocol", help="Protocol name (e.g., 'aave', 'uniswap', 'lido')")
+    parser.add_argument("protocol", nargs="?", help="Protocol name (e.g., 'aave', 'uniswap', 'lido')")
+    parser.add_argument("--protocols-file", help="File with one protocol name per line; reports are generated in parallel worker processes")
     parser.add_argument("--days", type=int, default=180, help="Days of TVL history (default: 180)")
     parser.add_argument("--full", action="store_true", help="Include web research template sections (default: verified on-chain data only)")
     parser.add_argument("--json", action="store_true", dest="raw_json", help="Output raw JSON")
     args = parser.parse_args()
 
+    if bool(args.protocol) == bool(args.protocols_file):
+        parser.error("provide either a protocol name or --protocols-file")
+
+    if args.protocols_file:
+        names = [
+            line.strip()
+            for line in Path(args.protocols_file).read_text().splitlines()
+            if line.strip()
+        ]
+        if not names:
+            print(f"Error: no protocol names in {args.protocols_file}", file=sys.stderr)
+            sys.exit(1)
+
+        try:
+            reports, failures = run_batch(names, tvl_days=args.days, verified_only=not args.full)
+        except DefiLlamaAPIError as e:
+            print(f"API Error: {e}", file=sys.stderr)
+            sys.exit(1)
+
+        for report in reports:
+            report_path = save_markdown_report(report)
+            print(f"Report saved to {report_path}", file=sys.stderr)
+        for name, error in failures:
+            print(f"Error for '{name}': {error}", file=sys.stderr)
+
+        if args.raw_json:
+            print(orjson.dumps(reports).decode())
+        else:
+            print(orjson.dumps(reports, option=orjson.OPT_INDENT_2).decode())
+        sys.exit(1 if failures and not reports else 0)
+
     client = DefiLlamaClient()
 
     try:
@@ -58,20 +157,13 @@ def main():
         print(f"API Error: {e}", file=sys.stderr)
         sys.exit(1)
 
-    # Save markdown report to reports/ directory
-    md = render_markdown(report)
-    slug = report["metadata"]["slug"]
-    filename = f"{slug}-{date.today().isoformat()}.md"
-    reports_dir = Path("reports")
-    reports_dir.mkdir(exist_ok=True)
-    report_path = reports_dir / filename
-    report_path.write_text(md)
+    report_path = save_markdown_report(report)
     print(f"Report saved to {report_path}", file=sys.stderr)
 
     if args.raw_json:
-        print(json.dumps(report))
+        print(orjson.dumps(report).decode())
     else:
-        print(json.dumps(report, indent=2))
+        print(orjson.dumps(report, option=orjson.OPT_INDENT_2).decode())
 
 
 if __name__ == "__main__":
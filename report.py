@@ -1,6 +1,9 @@
 """Report builder: transforms raw DeFiLlama data into a structured report dict."""
 
+import time
 from datetime import datetime, timezone
+from itertools import islice
+from operator import itemgetter
 
 from defillama import AGGREGATE_TVL_KEYS
 
@@ -17,14 +20,20 @@ def build_report(protocol_detail, protocol_meta, hacks, tvl_history_days=30, web
                       community_sentiment, red_flags from the web_research module
         verified_only: If True, only include verified on-chain data
     """
+    # Destructure the detail payload once; each helper gets only its slice
+    tvl_history = protocol_detail.get("tvl") or []
+    chain_tvls = protocol_detail.get("currentChainTvls") or {}
+    raises = protocol_detail.get("raises") or []
+    hallmarks = protocol_detail.get("hallmarks") or []
+
     report = {
         "metadata": _build_metadata(protocol_detail, protocol_meta),
         "verified_only": verified_only,
-        "tvl": _build_tvl_section(protocol_detail, tvl_history_days),
-        "chains": _build_chains_section(protocol_detail),
-        "funding": _build_funding_section(protocol_detail),
+        "tvl": _build_tvl_section(tvl_history, tvl_history_days),
+        "chains": _build_chains_section(chain_tvls),
+        "funding": _build_funding_section(raises),
         "hacks": _build_hacks_section(hacks),
-        "hallmarks": _build_hallmarks(protocol_detail),
+        "hallmarks": _build_hallmarks(hallmarks),
     }
 
     if web_research is not None:
@@ -50,69 +59,65 @@ def _build_metadata(detail, meta):
     }
 
 
-def _build_tvl_section(detail, history_days):
-    tvl_history = detail.get("tvl", [])
-
+def _build_tvl_section(tvl_history, history_days):
     # Current TVL is the last entry
     current_tvl = tvl_history[-1]["totalLiquidityUSD"] if tvl_history else 0.0
 
-    # Slice to requested number of days
-    recent = tvl_history[-history_days:] if tvl_history else []
-
-    # Resample to monthly (last entry per calendar month)
+    # Resample the requested tail to monthly (last entry per calendar month).
+    # islice walks the tail in place instead of copying a sublist, and
+    # itemgetter pulls both fields per entry in one C-level call. Bucketing
+    # on the (year, month) pair defers the strftime formatting to the
+    # handful of surviving monthly entries instead of every daily point.
+    start = max(0, len(tvl_history) - history_days)
+    get_fields = itemgetter("date", "totalLiquidityUSD")
     monthly = {}
-    for entry in recent:
-        iso = _unix_to_iso_date(entry["date"])
-        month_key = iso[:7]  # "YYYY-MM"
-        monthly[month_key] = {"date": iso, "tvl_usd": entry["totalLiquidityUSD"]}
+    for ts, tvl_usd in map(get_fields, islice(tvl_history, start, None)):
+        tm = time.gmtime(ts)
+        monthly[(tm.tm_year, tm.tm_mon)] = (ts, tvl_usd)
 
     return {
         "current_tvl_usd": current_tvl,
-        "tvl_history": list(monthly.values()),
+        "tvl_history": [
+            {"date": _unix_to_iso_date(ts), "tvl_usd": tvl_usd}
+            for ts, tvl_usd in monthly.values()
+        ],
     }
 
 
-def _build_chains_section(detail):
-    current_chain_tvls = detail.get("currentChainTvls", {})
-
-    # Filter to base chain names only
-    chain_tvl = {}
-    for key, value in current_chain_tvls.items():
-        if "-" in key:
-            continue
-        if key.lower() in AGGREGATE_TVL_KEYS:
-            continue
-        chain_tvl[key] = value
-
-    # Sort by TVL descending
-    sorted_chains = dict(sorted(chain_tvl.items(), key=lambda x: x[1], reverse=True))
+def _build_chains_section(current_chain_tvls):
+    # Filter to base chain names and sort by TVL descending, in one pass
+    pairs = [
+        (key, value)
+        for key, value in current_chain_tvls.items()
+        if "-" not in key and key.lower() not in AGGREGATE_TVL_KEYS
+    ]
+    pairs.sort(key=itemgetter(1), reverse=True)
 
     return {
-        "deployed_chains": list(sorted_chains.keys()),
-        "chain_tvl": sorted_chains,
+        "deployed_chains": [key for key, _ in pairs],
+        "chain_tvl": dict(pairs),
     }
 
 
-def _build_funding_section(detail):
-    raises = detail.get("raises", []) or []
-
-    rounds = sorted(
-        [
+def _build_funding_section(raises):
+    # Accumulate the total while materializing, avoiding a second pass
+    rounds = []
+    total = 0.0
+    for r in raises:
+        amount = r.get("amount")
+        total += amount or 0
+        rounds.append(
             {
                 "date": _unix_to_iso_date(r["date"]),
                 "round_type": r.get("round"),
-                "amount_usd_millions": r.get("amount"),
+                "amount_usd_millions": amount,
                 "lead_investors": r.get("leadInvestors", []) or [],
                 "other_investors": r.get("otherInvestors", []) or [],
                 "valuation": r.get("valuation"),
                 "source_url": r.get("source", ""),
             }
-            for r in raises
-        ],
-        key=lambda x: x["date"],
-    )
-
-    total = sum(r["amount_usd_millions"] or 0 for r in rounds)
+        )
+    rounds.sort(key=itemgetter("date"))
 
     return {
         "total_raised_usd_millions": total,
@@ -121,33 +126,37 @@ def _build_funding_section(detail):
 
 
 def _build_hacks_section(hacks):
-    incidents = sorted(
-        [
+    # Accumulate both totals while materializing, avoiding two extra passes
+    incidents = []
+    total_lost = 0
+    total_returned = 0
+    for h in hacks:
+        lost = h.get("amount", 0) or 0
+        returned = h.get("returnedFunds") or 0
+        total_lost += lost
+        total_returned += returned
+        incidents.append(
             {
                 "date": _unix_to_iso_date(h["date"]),
-                "amount_lost_usd": h.get("amount", 0) or 0,
+                "amount_lost_usd": lost,
                 "chain": h.get("chain", []),
                 "classification": h.get("classification", ""),
                 "technique": h.get("technique", ""),
-                "returned_funds_usd": h.get("returnedFunds") or 0,
+                "returned_funds_usd": returned,
                 "source_url": h.get("source", ""),
             }
-            for h in hacks
-        ],
-        key=lambda x: x["date"],
-        reverse=True,
-    )
+        )
+    incidents.sort(key=itemgetter("date"), reverse=True)
 
     return {
         "total_hacks": len(incidents),
-        "total_amount_lost_usd": sum(i["amount_lost_usd"] for i in incidents),
-        "total_amount_returned_usd": sum(i["returned_funds_usd"] for i in incidents),
+        "total_amount_lost_usd": total_lost,
+        "total_amount_returned_usd": total_returned,
         "incidents": incidents,
     }
 
 
-def _build_hallmarks(detail):
-    raw = detail.get("hallmarks") or []
+def _build_hallmarks(raw):
     return [
         {"date": _unix_to_iso_date(entry[0]), "event": entry[1]}
         for entry in raw
@@ -176,5 +185,9 @@ def _build_red_flags(data):
 
 
 def _unix_to_iso_date(ts):
-    """Convert unix timestamp to YYYY-MM-DD string."""
-    return datetime.fromtimestamp(ts, tz=timezone.utc).strftime("%Y-%m-%d")
+    """Convert unix timestamp to YYYY-MM-DD string.
+
+    time.gmtime/strftime avoid constructing a datetime per entry; this runs
+    once per row of TVL history, raises, hacks, and hallmarks.
+    """
+    return time.strftime("%Y-%m-%d", time.gmtime(ts))